@@ -1,6 +1,7 @@
 import logging
 import asyncio
 import os
+import time
 from dotenv import load_dotenv
 
 from livekit.agents import (
@@ -22,6 +23,9 @@ from pidog_actions import get_pidog_functions
 logger = logging.getLogger("pidog-agent-remote")
 load_dotenv()
 
+# Seconds before a "person appeared" event may trigger another greeting
+GREETING_COOLDOWN = 120.0
+
 
 class PiDogAgentRemote(Agent):
     """
@@ -37,15 +41,23 @@ class PiDogAgentRemote(Agent):
         # Get Pi host from environment or parameter
         pi_host = pi_host or os.getenv("PIDOG_PI_HOST", "raspberrypi.local")
         pi_port = int(os.getenv("PIDOG_PI_PORT", "5000"))
+        record_path = os.getenv("PIDOG_RECORD_PATH") or None
         
         # Initialize REMOTE PiDog controller
         logger.info(f"🐕 Connecting to PiDog at {pi_host}:{pi_port}...")
-        self._pidog = PiDogControllerRemote(pi_host=pi_host, pi_port=pi_port)
+        self._pidog = PiDogControllerRemote(
+            pi_host=pi_host, pi_port=pi_port, record_path=record_path
+        )
         
         # Video streaming setup
         self._video_source = None
         self._camera_task = None
         
+        # Presence events from the Pi (optional detector)
+        self._presence_task = None
+        self._scene_empty = False
+        self._last_greeting = float("-inf")
+        
         super().__init__(
             instructions="""You are PiDog - an AI-powered robot dog!
 
@@ -99,8 +111,12 @@ Remember: You're a robot dog - be playful, eager to please, and always ready for
         # Start camera streaming from PiDog
         await self._start_pidog_camera()
         
+        # Watch for people walking up to the dog
+        self._presence_task = asyncio.create_task(self._presence_loop())
+        
         # Initial greeting action
         logger.info("👋 Performing greeting action...")
+        self._last_greeting = time.monotonic()
         self._pidog.perform_action("wag_tail")
         
         # Generate AI greeting
@@ -115,6 +131,8 @@ Remember: You're a robot dog - be playful, eager to please, and always ready for
         # Stop camera
         if self._camera_task:
             self._camera_task.cancel()
+        if self._presence_task:
+            self._presence_task.cancel()
         
         # Shutdown hardware
         self._pidog.shutdown()
@@ -168,7 +186,47 @@ Remember: You're a robot dog - be playful, eager to please, and always ready for
             except Exception as e:
                 logger.error(f"Camera capture error: {e}")
             
-            await asyncio.sleep(0.2)  # 5 FPS
+            # 5 FPS, 1 FPS while the Pi reports an empty scene
+            await asyncio.sleep(1.0 if self._scene_empty else 0.2)
+    
+    async def _presence_loop(self):
+        """Poll presence events from the Pi and greet people who walk up"""
+        last_event_id = None
+        while True:
+            try:
+                data = await asyncio.to_thread(
+                    self._pidog.get_presence_events, last_event_id or 0
+                )
+                if data is not None and not data.get("enabled", True):
+                    logger.info("Presence detector not enabled on Pi")
+                    self._scene_empty = False
+                    return
+                
+                if data is not None:
+                    self._scene_empty = not data.get("present", True)
+                    
+                    # First poll only catches up, older events are stale
+                    if last_event_id is not None:
+                        for event in data.get("events", []):
+                            if event.get("type") != "person_appeared":
+                                continue
+                            if time.monotonic() - self._last_greeting < GREETING_COOLDOWN:
+                                logger.info("👀 Person appeared - greeted recently, skipping")
+                                continue
+                            
+                            logger.info("👀 Person appeared - greeting")
+                            self._last_greeting = time.monotonic()
+                            await asyncio.to_thread(self._pidog.perform_action, "wag_tail")
+                            self.session.generate_reply(
+                                instructions="Someone just walked up to you! Greet them excitedly as PiDog."
+                            )
+                    last_event_id = data.get("last_event_id", last_event_id)
+                    
+            except Exception as e:
+                logger.error(f"Presence loop error: {e}")
+                self._scene_empty = False
+            
+            await asyncio.sleep(0.5)
     
     async def on_function_call(self, function_name: str, arguments: dict):
         """
@@ -4,11 +4,14 @@ Works from any machine (Mac, cloud, etc.)
 """
 
 import logging
+import time
 import requests
 import cv2
 import numpy as np
 from typing import Optional
 
+from pidog_recorder import SessionRecorder
+
 logger = logging.getLogger("pidog-controller-remote")
 
 
@@ -19,14 +22,17 @@ class PiDogControllerRemote:
     The hardware server runs on the Pi, this controller runs anywhere.
     """
     
-    def __init__(self, pi_host: str = "raspberrypi.local", pi_port: int = 5000):
+    def __init__(self, pi_host: str = "raspberrypi.local", pi_port: int = 5000,
+                 record_path: Optional[str] = None):
         """
         Args:
             pi_host: Hostname or IP of Raspberry Pi (e.g., "192.168.1.100")
             pi_port: Port number of hardware server (default: 5000)
+            record_path: Optional file to record frames and actions to
         """
         self.base_url = f"http://{pi_host}:{pi_port}"
         self.mode = "remote"
+        self.recorder = SessionRecorder(record_path) if record_path else None
         
         # Test connection
         try:
@@ -50,8 +56,12 @@ class PiDogControllerRemote:
             numpy.ndarray: BGR image frame
         """
         try:
+            started = time.monotonic()
             response = requests.get(f"{self.base_url}/camera/frame", timeout=1)
             if response.ok:
+                if self.recorder:
+                    self.recorder.record_frame(response.content, time.monotonic() - started)
+                
                 # Decode JPEG to numpy array
                 img_array = np.frombuffer(response.content, dtype=np.uint8)
                 frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
@@ -74,6 +84,7 @@ class PiDogControllerRemote:
             dict: Result with success status
         """
         try:
+            started = time.monotonic()
             response = requests.post(
                 f"{self.base_url}/action/{action_name}",
                 json=kwargs,
@@ -83,6 +94,10 @@ class PiDogControllerRemote:
             if response.ok:
                 result = response.json()
                 logger.info(f"✅ Remote action '{action_name}' executed")
+                if self.recorder:
+                    self.recorder.record_action(
+                        action_name, kwargs, result, time.monotonic() - started
+                    )
                 return result
             else:
                 logger.error(f"❌ Action '{action_name}' failed: {response.status_code}")
@@ -92,6 +107,33 @@ class PiDogControllerRemote:
             logger.error(f"❌ Action '{action_name}' failed: {e}")
             return {"success": False, "error": str(e)}
     
+    def get_presence_events(self, since: int = 0) -> Optional[dict]:
+        """
+        Poll presence events from the Pi's detector.
+        
+        Args:
+            since: Only return events newer than this event id
+        
+        Returns:
+            dict: Events and presence state ({"enabled": False} if the
+                detector is disabled), or None on a network error
+        """
+        try:
+            response = requests.get(
+                f"{self.base_url}/presence/events",
+                params={"since": since},
+                timeout=1
+            )
+            if response.ok:
+                return response.json()
+            if response.status_code == 404:
+                return {"enabled": False}
+            logger.error(f"Presence events failed: {response.status_code}")
+        except Exception as e:
+            logger.error(f"Presence events error: {e}")
+        
+        return None
+    
     def shutdown(self):
         """Clean shutdown of hardware on Pi"""
         try:
@@ -100,3 +142,6 @@ class PiDogControllerRemote:
                 logger.info("✅ Pi hardware shutdown")
         except Exception as e:
             logger.error(f"Shutdown error: {e}")
+        
+        if self.recorder:
+            self.recorder.close()
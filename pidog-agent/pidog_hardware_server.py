@@ -5,9 +5,12 @@ Exposes HTTP API for controlling PiDog hardware remotely
 """
 
 from flask import Flask, jsonify, request, Response
+import argparse
 import logging
 import time
 
+from pidog_recorder import SessionRecorder, SessionReplay
+
 # Try to import hardware
 try:
     from pidog import Pidog
@@ -25,6 +28,16 @@ logger = logging.getLogger("pidog-hardware-server")
 dog = None
 camera_active = False
 
+# Optional session recording / replay (see pidog_recorder.py)
+recorder = None
+replay = None
+
+# Optional presence detector (see pidog_presence.py)
+presence = None
+IDLE_FRAME_INTERVAL = 2.0  # Seconds between re-encodes while the scene is empty
+last_jpeg = None
+last_jpeg_time = 0.0
+
 def init_hardware():
     """Initialize PiDog hardware"""
     global dog, camera_active
@@ -56,7 +69,10 @@ def health():
     return jsonify({
         "status": "ok",
         "hardware_available": HARDWARE_AVAILABLE,
-        "camera_active": camera_active
+        "camera_active": camera_active,
+        "recording": recorder is not None,
+        "replay": replay is not None,
+        "presence": presence.state() if presence else None
     })
 
 @app.route('/action/<action_name>', methods=['POST'])
@@ -66,11 +82,18 @@ def perform_action(action_name):
     speed = data.get('speed', 80)
     steps = data.get('steps', 3)
     
+    if replay:
+        return replay_action(action_name)
+    
     if not HARDWARE_AVAILABLE:
         logger.info(f"MOCK: {action_name} (speed={speed})")
-        return jsonify({"success": True, "action": action_name, "mock": True})
+        result = {"success": True, "action": action_name, "mock": True}
+        if recorder:
+            recorder.record_action(action_name, data, result)
+        return jsonify(result)
     
     try:
+        started = time.monotonic()
         if action_name in ["forward", "backward", "turn_left", "turn_right"]:
             dog.do_action(action_name, step_count=steps, speed=speed)
         else:
@@ -78,7 +101,10 @@ def perform_action(action_name):
         
         time.sleep(0.5)
         logger.info(f"✅ Action: {action_name}")
-        return jsonify({"success": True, "action": action_name})
+        result = {"success": True, "action": action_name}
+        if recorder:
+            recorder.record_action(action_name, data, result, time.monotonic() - started)
+        return jsonify(result)
     
     except Exception as e:
         logger.error(f"Action failed: {e}")
@@ -87,6 +113,27 @@ def perform_action(action_name):
 @app.route('/camera/frame', methods=['GET'])
 def get_camera_frame():
     """Get current camera frame as JPEG"""
+    global last_jpeg, last_jpeg_time
+    
+    # Scene empty: serve the cached frame instead of re-encoding
+    if (presence and not presence.present and last_jpeg
+            and time.monotonic() - last_jpeg_time < IDLE_FRAME_INTERVAL):
+        if recorder:
+            recorder.record_frame(last_jpeg)
+        return Response(last_jpeg, mimetype='image/jpeg')
+    
+    if replay:
+        frame = replay.current_frame()
+        if frame is None:
+            return jsonify({"error": "Recording has no frames"}), 500
+        
+        # Reproduce the original capture/encode time, scaled by playback speed
+        jpeg, duration = frame
+        if replay.speed > 0:
+            time.sleep(duration / replay.speed)
+        last_jpeg, last_jpeg_time = jpeg, time.monotonic()
+        return Response(jpeg, mimetype='image/jpeg')
+    
     if not HARDWARE_AVAILABLE or not camera_active:
         # Return mock frame
         import numpy as np
@@ -94,19 +141,59 @@ def get_camera_frame():
         cv2.putText(mock_frame, "MOCK CAMERA", (200, 240),
                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
         _, buffer = cv2.imencode('.jpg', mock_frame)
-        return Response(buffer.tobytes(), mimetype='image/jpeg')
+        jpeg = buffer.tobytes()
+        if recorder:
+            recorder.record_frame(jpeg)
+        return Response(jpeg, mimetype='image/jpeg')
     
     try:
+        started = time.monotonic()
         frame = Vilib.img
         if frame is not None:
             frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
             _, buffer = cv2.imencode('.jpg', frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            return Response(buffer.tobytes(), mimetype='image/jpeg')
+            jpeg = buffer.tobytes()
+            last_jpeg, last_jpeg_time = jpeg, time.monotonic()
+            if recorder:
+                recorder.record_frame(jpeg, time.monotonic() - started)
+            return Response(jpeg, mimetype='image/jpeg')
     except Exception as e:
         logger.error(f"Camera error: {e}")
     
     return jsonify({"error": "Camera unavailable"}), 500
 
+@app.route('/presence/events', methods=['GET'])
+def get_presence_events():
+    """Get presence events newer than ?since=<event id>"""
+    if not presence:
+        return jsonify({"error": "Presence detector disabled"}), 404
+    
+    since = request.args.get('since', 0, type=int)
+    return jsonify(presence.poll(since))
+
+def read_replay_frame():
+    """Decode the replay frame on screen as RGB for the presence detector"""
+    import numpy as np
+    
+    jpeg = replay.peek_frame()
+    if jpeg is None:
+        return None
+    frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+def replay_action(action_name):
+    """Answer an action request from the recording being replayed"""
+    recorded = replay.next_action(action_name)
+    if recorded is None:
+        logger.info(f"REPLAY: {action_name} (not in recording)")
+        return jsonify({"success": True, "action": action_name, "replay": True})
+    
+    # Reproduce the original execution time, scaled by playback speed
+    if replay.speed > 0:
+        time.sleep(recorded["duration"] / replay.speed)
+    logger.info(f"REPLAY: {action_name}")
+    return jsonify(recorded["result"])
+
 @app.route('/shutdown', methods=['POST'])
 def shutdown():
     """Shutdown hardware cleanly"""
@@ -119,10 +206,47 @@ def shutdown():
         except Exception as e:
             logger.error(f"Shutdown error: {e}")
     
+    if recorder:
+        recorder.close()
+    
+    if presence:
+        presence.stop()
+    
     return jsonify({"success": True})
 
 if __name__ == '__main__':
-    init_hardware()
+    parser = argparse.ArgumentParser(description="PiDog hardware server")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--record", metavar="FILE",
+                        help="Record served frames and actions to FILE")
+    source.add_argument("--replay", metavar="FILE",
+                        help="Serve a recorded session instead of hardware")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="Playback speed multiplier (0 = next frame per request)")
+    parser.add_argument("--presence", action="store_true",
+                        help="Run the motion/presence detector and throttle idle streaming")
+    args = parser.parse_args()
+    
+    if args.replay:
+        # Replay backend - no hardware needed
+        replay = SessionReplay(args.replay, speed=args.replay_speed)
+    else:
+        init_hardware()
+        if args.record:
+            recorder = SessionRecorder(args.record)
+    
+    if args.presence:
+        if replay:
+            import cv2  # Only imported with hardware otherwise
+            from pidog_presence import PresenceDetector
+            presence = PresenceDetector(read_replay_frame)
+            presence.start()
+        elif HARDWARE_AVAILABLE and camera_active:
+            from pidog_presence import PresenceDetector
+            presence = PresenceDetector(lambda: Vilib.img)
+            presence.start()
+        else:
+            logger.warning("Presence detector needs the camera or --replay - disabled")
     
     # Run server
     app.run(
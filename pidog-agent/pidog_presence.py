@@ -0,0 +1,187 @@
+"""
+PiDog Presence Detector - Runs on Raspberry Pi
+Lightweight motion/person detection on downsampled camera frames
+
+Motion is found by frame differencing at low resolution. A HOG people
+detector only runs while there is motion or someone is already present,
+so an empty room costs almost nothing.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("pidog-presence")
+
+# Event types
+EVENT_MOTION = "motion"
+EVENT_PERSON_APPEARED = "person_appeared"
+EVENT_SCENE_EMPTY = "scene_empty"
+
+
+class PresenceDetector:
+    """
+    Background thread publishing motion and presence events.
+
+    Events are kept in a short in-memory log that clients read with
+    `poll()`.
+    """
+
+    def __init__(
+        self,
+        get_frame: Callable[[], Optional[np.ndarray]],
+        interval: float = 0.25,
+        motion_threshold: float = 0.02,
+        idle_timeout: float = 10.0,
+        person_timeout: float = 60.0,
+        person_check_interval: float = 1.0,
+        detect_people: bool = True,
+    ):
+        """
+        Args:
+            get_frame: Returns the latest RGB camera frame, e.g. Vilib.img (or None)
+            interval: Seconds between detector passes
+            motion_threshold: Fraction of changed pixels that counts as motion
+            idle_timeout: Seconds without motion before the scene is empty
+            person_timeout: Seconds a detected person keeps the scene occupied,
+                long enough to cover someone sitting still
+            person_check_interval: Minimum seconds between people detector runs
+            detect_people: Run the HOG people detector (motion only if False)
+        """
+        self._get_frame = get_frame
+        self.interval = interval
+        self.motion_threshold = motion_threshold
+        self.idle_timeout = idle_timeout
+        self.person_timeout = person_timeout
+        self.person_check_interval = person_check_interval
+
+        self._hog = None
+        if detect_people:
+            self._hog = cv2.HOGDescriptor()
+            self._hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=100)
+        self._last_event_id = 0
+
+        self._previous = None
+        self._moving = False
+        self._last_motion = float("-inf")
+        self._last_person = float("-inf")
+        self._last_person_check = float("-inf")
+        self.present = False
+        self.person_present = False
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the detector thread"""
+        self._thread = threading.Thread(target=self._run, name="presence-detector", daemon=True)
+        self._thread.start()
+        logger.info("✅ Presence detector started")
+
+    def stop(self):
+        """Stop the detector thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def poll(self, since: int = 0) -> dict:
+        """
+        Return events newer than `since` together with the current state.
+
+        Both are read under one lock, so `last_event_id` always matches
+        the newest event in `events`.
+        """
+        with self._lock:
+            return {
+                "events": [event for event in self._events if event["id"] > since],
+                **self._state(),
+            }
+
+    def state(self) -> dict:
+        """Current presence state"""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> dict:
+        return {
+            "present": self.present,
+            "person_present": self.person_present,
+            "last_event_id": self._last_event_id,
+        }
+
+    def _publish(self, event_type: str):
+        with self._lock:
+            self._last_event_id += 1
+            self._events.append({
+                "id": self._last_event_id,
+                "type": event_type,
+                "timestamp": time.time(),
+            })
+        logger.info(f"👀 Presence event: {event_type}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                frame = self._get_frame()
+                if frame is not None:
+                    self._process(frame, time.monotonic())
+            except Exception as e:
+                logger.error(f"Presence detector error: {e}")
+
+            self._stop.wait(self.interval)
+
+    def _process(self, frame: np.ndarray, now: float):
+        # Motion: difference of blurred 160x120 grayscale frames
+        small = cv2.resize(frame, (160, 120), interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_RGB2GRAY), (5, 5), 0)
+
+        moving = False
+        if self._previous is not None:
+            diff = cv2.absdiff(gray, self._previous)
+            _, mask = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+            moving = cv2.countNonZero(mask) / mask.size > self.motion_threshold
+        self._previous = gray
+
+        if moving:
+            self._last_motion = now
+            if not self._moving:
+                self._publish(EVENT_MOTION)
+        self._moving = moving
+
+        # People: only worth checking when something is happening
+        if (
+            self._hog is not None
+            and (moving or self.present)
+            and now - self._last_person_check >= self.person_check_interval
+        ):
+            self._last_person_check = now
+            medium = cv2.resize(frame, (320, 240), interpolation=cv2.INTER_AREA)
+            medium = cv2.cvtColor(medium, cv2.COLOR_RGB2BGR)
+            rects, _ = self._hog.detectMultiScale(medium, winStride=(8, 8))
+            if len(rects) > 0:
+                self._last_person = now
+                if not self.person_present:
+                    with self._lock:
+                        self.person_present = True
+                    self._publish(EVENT_PERSON_APPEARED)
+
+        present = (
+            now - self._last_motion < self.idle_timeout
+            or now - self._last_person < self.person_timeout
+        )
+        if self.present and not present:
+            with self._lock:
+                self.present = False
+                self.person_present = False
+            self._publish(EVENT_SCENE_EMPTY)
+        elif present and not self.present:
+            with self._lock:
+                self.present = True
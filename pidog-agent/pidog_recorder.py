@@ -0,0 +1,329 @@
+"""
+PiDog Session Recorder - Record and replay camera/action sessions
+Lets you benchmark the camera pipeline without a live Pi or LiveKit room
+
+File format (one append-only file per session):
+    header:  magic (8 bytes) + version (uint16)
+    records: kind (uint8) + timestamp (float64) + duration (float64)
+             + payload length (uint32) + payload
+
+Frame payloads are raw JPEG bytes, action payloads are JSON.
+Timestamps are seconds since the recording started.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_right
+from typing import Optional, Tuple
+
+logger = logging.getLogger("pidog-recorder")
+
+MAGIC = b"PIDOGREC"
+VERSION = 1
+HEADER = struct.Struct("<8sH")
+RECORD = struct.Struct("<BddI")
+
+KIND_FRAME = 1
+KIND_ACTION = 2
+
+
+class SessionRecorder:
+    """
+    Appends frames and action requests to a session file.
+
+    Safe to share between threads (Flask serves requests concurrently).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Output file (overwritten if it already exists)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+        self._file.flush()
+        self._start = time.monotonic()
+        logger.info(f"⏺️  Recording session to {path}")
+
+    def record_frame(self, jpeg: bytes, duration: float = 0.0):
+        """
+        Append a JPEG frame.
+
+        Args:
+            jpeg: Encoded frame bytes
+            duration: Seconds it took to capture/fetch the frame
+        """
+        self._append(KIND_FRAME, duration, jpeg)
+
+    def record_action(self, action_name: str, params: dict, result: dict, duration: float = 0.0):
+        """
+        Append an action request and its result.
+
+        Args:
+            action_name: Action name (sit, bark, etc.)
+            params: Parameters sent with the action
+            result: Result returned for the action
+            duration: Seconds the action took to execute
+        """
+        payload = json.dumps({
+            "action": action_name,
+            "params": params,
+            "result": result,
+        }).encode("utf-8")
+        self._append(KIND_ACTION, duration, payload)
+
+    def _append(self, kind: int, duration: float, payload: bytes):
+        with self._lock:
+            if self._file.closed:
+                return
+            timestamp = time.monotonic() - self._start
+            self._file.write(RECORD.pack(kind, timestamp, duration, len(payload)))
+            self._file.write(payload)
+            self._file.flush()
+
+    def close(self):
+        """Flush and close the session file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info(f"✅ Recording saved to {self.path}")
+
+
+class SessionReplay:
+    """
+    Reads a recorded session back.
+
+    The file is memory-mapped and indexed once on open, so frames are
+    served straight from the page cache without loading the whole file.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = True):
+        """
+        Args:
+            path: Session file written by SessionRecorder
+            speed: Playback speed multiplier (0 = next frame on every request)
+            loop: Restart from the beginning when the recording ends
+        """
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+
+        self._file = open(path, "rb")
+        try:
+            if os.fstat(self._file.fileno()).st_size < HEADER.size:
+                raise ValueError(f"Not a PiDog session file: {path}")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, version = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a PiDog session file: {path}")
+
+        # Index: (timestamp, duration, offset, length) per frame
+        self.frames = []
+        self.actions = []
+        self._build_index()
+        self._frame_times = [frame[0] for frame in self.frames]
+
+        # Actions are replayed per name, in recorded order
+        self._actions_by_name = {}
+        for action in self.actions:
+            self._actions_by_name.setdefault(action["action"], []).append(action)
+
+        self._lock = threading.Lock()
+        self._next_frame = 0
+        self._last_frame = 0
+        self._action_cursors = {}
+        self._cycle = 0
+        self._start = None  # Playback clock starts on the first frame request
+
+        logger.info(
+            f"▶️  Replaying {path}: {len(self.frames)} frames, "
+            f"{len(self.actions)} actions, {self.length:.1f}s (speed={speed})"
+        )
+
+    def _build_index(self):
+        offset = HEADER.size
+        size = len(self._mm)
+        while offset + RECORD.size <= size:
+            kind, timestamp, duration, length = RECORD.unpack_from(self._mm, offset)
+            offset += RECORD.size
+            if offset + length > size:
+                logger.warning(f"Truncated record at end of {self.path}, ignoring")
+                break
+
+            if kind == KIND_FRAME:
+                self.frames.append((timestamp, duration, offset, length))
+            elif kind == KIND_ACTION:
+                entry = json.loads(self._mm[offset:offset + length])
+                entry["timestamp"] = timestamp
+                entry["duration"] = duration
+                self.actions.append(entry)
+            offset += length
+
+    @property
+    def length(self) -> float:
+        """Recording length in seconds"""
+        last_frame = self.frames[-1][0] if self.frames else 0.0
+        last_action = self.actions[-1]["timestamp"] if self.actions else 0.0
+        return max(last_frame, last_action)
+
+    @property
+    def frame_interval(self) -> float:
+        """Average seconds between recorded frames"""
+        if len(self.frames) < 2:
+            return 0.0
+        return (self.frames[-1][0] - self.frames[0][0]) / (len(self.frames) - 1)
+
+    @property
+    def frame_span(self) -> float:
+        """Seconds of frame playback, including the last frame's display time"""
+        if not self.frames:
+            return 0.0
+        return self.frames[-1][0] - self.frames[0][0] + self.frame_interval
+
+    def get_frame_bytes(self, index: int) -> bytes:
+        """Return the JPEG bytes of frame `index`"""
+        _, _, offset, length = self.frames[index]
+        return self._mm[offset:offset + length]
+
+    def current_frame(self) -> Optional[Tuple[bytes, float]]:
+        """
+        Return the frame due at the current playback position.
+
+        With speed > 0 the frame is picked by elapsed wall-clock time,
+        with speed 0 every call advances to the next frame.
+
+        Returns:
+            tuple: (JPEG bytes, recorded capture duration), or None if
+                the recording has no frames
+        """
+        if not self.frames:
+            return None
+
+        with self._lock:
+            index = self._frame_index(advance=True)
+
+        return self.get_frame_bytes(index), self.frames[index][1]
+
+    def peek_frame(self) -> Optional[bytes]:
+        """Return the frame currently on screen without advancing playback"""
+        if not self.frames:
+            return None
+
+        with self._lock:
+            index = self._frame_index(advance=False)
+
+        return self.get_frame_bytes(index)
+
+    def _frame_index(self, advance: bool) -> int:
+        if self.speed > 0:
+            now = time.monotonic()
+            if self._start is None:
+                if not advance:
+                    return 0
+                self._start = now
+            position = (now - self._start) * self.speed
+            cycle = 0
+            if self.loop and self.frame_span > 0:
+                cycle, position = divmod(position, self.frame_span)
+            if cycle != self._cycle:
+                # Playback wrapped around: replay actions from the start too
+                self._cycle = cycle
+                self._action_cursors.clear()
+            position += self._frame_times[0]
+            return max(bisect_right(self._frame_times, position) - 1, 0)
+
+        if not advance:
+            return self._last_frame
+
+        index = self._last_frame = self._next_frame
+        self._next_frame += 1
+        if self._next_frame >= len(self.frames):
+            if self.loop:
+                self._next_frame = 0
+                self._action_cursors.clear()
+            else:
+                self._next_frame = len(self.frames) - 1
+        return index
+
+    def next_action(self, action_name: str) -> Optional[dict]:
+        """
+        Return the next recorded action matching `action_name`.
+
+        Each action name keeps its own position, so requests for other
+        actions never skip records. Returns None if the recording has no
+        further matching action.
+        """
+        with self._lock:
+            queue = self._actions_by_name.get(action_name)
+            if not queue:
+                return None
+
+            cursor = self._action_cursors.get(action_name, 0)
+            if cursor >= len(queue):
+                if not self.loop:
+                    return None
+                cursor = 0
+            self._action_cursors[action_name] = cursor + 1
+            return queue[cursor]
+
+    def close(self):
+        """Release the memory map"""
+        self._mm.close()
+        self._file.close()
+
+
+def summarize(path: str) -> dict:
+    """
+    Compute timing statistics for a recorded session.
+
+    Returns:
+        dict: Frame rate and latency/duration percentiles
+    """
+    replay = SessionReplay(path, speed=0)
+    try:
+        frame_durations = sorted(frame[1] for frame in replay.frames)
+        action_durations = sorted(action["duration"] for action in replay.actions)
+
+        def percentile(values, pct):
+            if not values:
+                return 0.0
+            return values[min(int(len(values) * pct), len(values) - 1)]
+
+        return {
+            "length_s": replay.length,
+            "frames": len(replay.frames),
+            "fps": 1 / replay.frame_interval if replay.frame_interval else 0.0,
+            "frame_latency_p50_ms": percentile(frame_durations, 0.50) * 1000,
+            "frame_latency_p95_ms": percentile(frame_durations, 0.95) * 1000,
+            "actions": len(replay.actions),
+            "action_duration_p50_ms": percentile(action_durations, 0.50) * 1000,
+            "action_duration_p95_ms": percentile(action_durations, 0.95) * 1000,
+        }
+    finally:
+        replay.close()
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python3 pidog_recorder.py <session-file>")
+        sys.exit(1)
+
+    for key, value in summarize(sys.argv[1]).items():
+        if isinstance(value, float):
+            print(f"{key:>24}: {value:.2f}")
+        else:
+            print(f"{key:>24}: {value}")